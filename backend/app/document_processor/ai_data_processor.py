@@ -5,8 +5,13 @@ Uses ChatGPT API for intelligent data extraction and validation.
 
 import os
 import re
+import copy
 import json
+import hashlib
 import logging
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate, islice
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
@@ -19,6 +24,71 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Structured extraction results kept per processor, keyed by a hash of the raw text
+EXTRACTION_CACHE_SIZE = 16
+
+# Precompiled patterns for rule-based extraction
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Header fields as one alternation; the named group that matched is the field name.
+# The lookahead keeps matches zero-width so one field can never swallow another.
+_HEADER_PATTERN = (
+    r'(?=ITEM\s*:?\s*(?P<item_number>\d+)'
+    r'|REVISION\s*:?\s*(?P<revision>\d+)'
+    r'|CPRS\s*:?\s*(?P<cprs_number>\d+-[A-Z])'
+    r'|ISSUE\s*(?:DATE)?\s*:?\s*(?P<issue_date>[A-Z]{3}\s+\d{1,2},?\s+\d{4})'
+    r'|EFFECTIVE\s*(?:DATE)?\s*:?\s*(?P<effective_date>[A-Z]{3}\s+\d{1,2},?\s+\d{4})'
+    r'|EXPIR\w*\s*(?:DATE)?\s*:?\s*(?P<expiration_date>[A-Z]{3}\s+\d{1,2},?\s+\d{4}))'
+)
+_HEADER_RE = re.compile(_HEADER_PATTERN, re.IGNORECASE)
+# Case-sensitive twins for scanning the upper-cased document; without IGNORECASE the
+# engine can use its literal-prefix fast paths (several times faster on long text)
+_HEADER_UPPER_RE = re.compile(_HEADER_PATTERN)
+_DATE_FIELDS = ('issue_date', 'effective_date', 'expiration_date')
+_MONTH_NUMBERS = {
+    'JAN': '01', 'FEB': '02', 'MAR': '03', 'APR': '04',
+    'MAY': '05', 'JUN': '06', 'JUL': '07', 'AUG': '08',
+    'SEP': '09', 'OCT': '10', 'NOV': '11', 'DEC': '12'
+}
+
+_STCC_RE = re.compile(r'(\d{2}\s+\d{3}\s+\d{2})')
+_COMMODITY_KEYWORDS = ('WHEAT', 'GRAIN', 'CORN', 'SOYBEAN', 'BARLEY', 'CANOLA')
+_COMMODITY_KEYWORDS_RE = re.compile('|'.join(_COMMODITY_KEYWORDS))
+_EDGE_PUNCTUATION_RE = re.compile(r'^[^\w]+|[^\w]+$')
+
+# Start of any line carrying a '$' or a decimal amount (a rate candidate)
+_RATE_LINE_RE = re.compile(r'^[^\n]*?(?:\$|\d\.\d{2})', re.MULTILINE)
+_RATE_AMOUNT_RE = re.compile(r'\$?(\d+\.\d{2})')
+_TRAIN_TYPES = ('SINGLE CAR', 'UNIT TRAIN', '25 CAR', '50 CAR', '100 CAR', 'LOW CAP', 'HIGH CAP')
+_EQUIPMENT_TYPES = ('COVERED HOPPER', 'GONDOLA', 'TANK CAR', 'BOXCAR')
+_TO_LOCATIONS_RE = re.compile(r'([A-Z][A-Za-z\s]+[A-Z]{2})\s+(?:to|TO)\s+([A-Z][A-Za-z\s]+[A-Z]{2})')
+_LOCATION_RE = re.compile(r'([A-Z][A-Za-z\s]+\s+[A-Z]{2})')
+# Route code forms in priority order; each lookahead scans the whole line, so an
+# earlier form wins wherever it appears, in a single match call
+_ROUTE_CODE_RE = re.compile(
+    r'(?=.*?CP(?P<cp>\d{3,4}))'
+    r'|(?=.*?ROUTE\s*:?\s*(?P<route>\d{3,4}))'
+    r'|(?=.*?\b(?P<number>\d{4})\b)',
+    re.IGNORECASE | re.DOTALL
+)
+
+_NUMBERED_NOTE_RE = re.compile(r'^(\d+)\.?\s*(.+)')
+_PROVISION_KEYWORDS = r'SUBJECT TO|APPLIES|MINIMUM|MAXIMUM|EQUIPMENT'
+_PROVISION_KEYWORDS_RE = re.compile(_PROVISION_KEYWORDS, re.IGNORECASE)
+# Start of any line that could be a numbered, asterisk or provision note
+_NOTE_LINE_PATTERN = rf'^[^\S\n]*[\d*]|^[^\n]*?(?:{_PROVISION_KEYWORDS})'
+_NOTE_LINE_RE = re.compile(_NOTE_LINE_PATTERN, re.MULTILINE | re.IGNORECASE)
+_NOTE_LINE_UPPER_RE = re.compile(_NOTE_LINE_PATTERN, re.MULTILINE)
+_CANADIAN_CITIES = ('VANCOUVER BC', 'CALGARY AB', 'WINNIPEG MB', 'TORONTO ON')
+_US_CITIES = ('CHICAGO IL', 'MINNEAPOLIS MN', 'KANSAS CITY MO')
+_CANADIAN_CITIES_RE = re.compile('|'.join(_CANADIAN_CITIES))
+_US_CITIES_RE = re.compile('|'.join(_US_CITIES))
+_FROM_TO_RE = re.compile(r'FROM\s+([^TO\n]+)\s+TO\s+([^\n]+)', re.IGNORECASE)
+_CAD_MARKERS = ('CAD', 'CANADIAN', 'C$')
+
+_NON_EMPTY_LINE_RE = re.compile(r'^[^\S\n]*\S', re.MULTILINE)
+_TABLE_MARKER_RE = re.compile(r'TABLE|ORIGIN|DESTINATION')
+
 class AIDataProcessor:
     """AI-enhanced data processor using ChatGPT for intelligent extraction"""
     
@@ -26,6 +96,7 @@ class AIDataProcessor:
         """Initialize AI data processor"""
         self.openai_client = None
         self.ai_available = False
+        self._extraction_cache: "OrderedDict[str, Tuple[Dict[str, Any], str]]" = OrderedDict()
         
         # State/Province codes for validation
         self.state_province_codes = {
@@ -89,32 +160,57 @@ class AIDataProcessor:
             logger.warning("Insufficient text for processing")
             return self._empty_result(filename, file_size)
         
+        final_data, extraction_method = self._extract_structured_data(raw_text)
+        
+        # Add metadata
+        final_data['pdf_name'] = filename
+        final_data['metadata'] = self._create_metadata(raw_text, filename, file_size, extraction_method)
+        
+        logger.info(f"Extracted: {len(final_data.get('rates', []))} rates, "
+                   f"{len(final_data.get('commodities', []))} commodities, "
+                   f"{len(final_data.get('notes', []))} notes")
+        
+        return final_data
+    
+    def _extract_structured_data(self, raw_text: str) -> Tuple[Dict[str, Any], str]:
+        """Run rule-based and AI extraction, reusing the result for text seen recently"""
+        cache_key = hashlib.sha256(raw_text.encode('utf-8', 'surrogatepass')).hexdigest()
+        cached = self._extraction_cache.get(cache_key)
+        if cached is not None:
+            self._extraction_cache.move_to_end(cache_key)
+            logger.info("Reusing extraction result for previously processed text")
+            data, extraction_method = cached
+            return copy.deepcopy(data), extraction_method
+        
         # Start with rule-based extraction
         rule_based_data = self._rule_based_extraction(raw_text)
         
+        # A transient AI failure (an exception or an unparseable, empty reply) should
+        # not pin the rule-based result for this text
+        cacheable = True
+        
         # Enhance with AI if available
         if self.ai_available and self.openai_client:
             try:
                 ai_enhanced_data = self._ai_enhanced_extraction(raw_text)
                 final_data = self._merge_extraction_results(rule_based_data, ai_enhanced_data)
                 extraction_method = "AI_ENHANCED"
+                cacheable = bool(ai_enhanced_data)
             except Exception as e:
                 logger.warning(f"AI extraction failed: {e}, using rule-based only")
                 final_data = rule_based_data
                 extraction_method = "RULE_BASED_FALLBACK"
+                cacheable = False
         else:
             final_data = rule_based_data
             extraction_method = "RULE_BASED_ONLY"
         
-        # Add metadata
-        final_data['pdf_name'] = filename
-        final_data['metadata'] = self._create_metadata(raw_text, filename, file_size, extraction_method)
-        
-        logger.info(f"Extracted: {len(final_data.get('rates', []))} rates, "
-                   f"{len(final_data.get('commodities', []))} commodities, "
-                   f"{len(final_data.get('notes', []))} notes")
+        if cacheable:
+            self._extraction_cache[cache_key] = (copy.deepcopy(final_data), extraction_method)
+            if len(self._extraction_cache) > EXTRACTION_CACHE_SIZE:
+                self._extraction_cache.popitem(last=False)
         
-        return final_data
+        return final_data, extraction_method
     
     def _ai_enhanced_extraction(self, text: str) -> Dict[str, Any]:
         """Use ChatGPT for intelligent data extraction"""
@@ -204,7 +300,7 @@ Return only valid JSON, no additional text."""
             except json.JSONDecodeError as e:
                 logger.error(f"AI returned invalid JSON: {e}")
                 # Try to extract JSON from response
-                json_match = re.search(r'\{.*\}', ai_result, re.DOTALL)
+                json_match = _JSON_OBJECT_RE.search(ai_result)
                 if json_match:
                     try:
                         parsed_result = json.loads(json_match.group(0))
@@ -221,86 +317,99 @@ Return only valid JSON, no additional text."""
     def _rule_based_extraction(self, text: str) -> Dict[str, Any]:
         """Fallback rule-based extraction"""
         
+        # Split and upper-case the document once and share them across extractors
+        lines, line_starts = self._index_lines(text)
+        text_upper = text.upper()
+        rates, notes = self._extract_rates_and_notes(text, text_upper, lines, line_starts)
+        
         extracted_data = {
-            'header': self._extract_header_data(text),
-            'commodities': self._extract_commodities(text),
-            'rates': self._extract_rates(text),
-            'notes': self._extract_notes(text),
+            'header': self._extract_header_data(text, text_upper),
+            'commodities': self._extract_commodities(text, text_upper, lines, line_starts),
+            'rates': rates,
+            'notes': notes,
             'origin_info': '',
             'destination_info': '',
-            'currency': self._determine_currency(text)
+            'currency': self._determine_currency(text_upper)
         }
         
         # Extract locations
-        origin, destination = self._extract_locations(text)
+        origin, destination = self._extract_locations(text, text_upper)
         extracted_data['origin_info'] = origin
         extracted_data['destination_info'] = destination
         
         return extracted_data
     
-    def _extract_header_data(self, text: str) -> Dict[str, Any]:
+    def _index_lines(self, text: str) -> Tuple[List[str], List[int]]:
+        """Split text into lines and record the character offset each line starts at"""
+        lines = text.split('\n')
+        line_starts = list(accumulate((len(line) + 1 for line in lines[:-1]), initial=0))
+        return lines, line_starts
+    
+    def _extract_header_data(self, text: str, text_upper: Optional[str] = None) -> Dict[str, Any]:
         """Extract header information using regex patterns"""
         header = {}
         
-        # Item number
-        item_match = re.search(r'ITEM\s*:?\s*(\d+)', text, re.IGNORECASE)
-        if item_match:
-            header['item_number'] = item_match.group(1)
-        
-        # Revision
-        revision_match = re.search(r'REVISION\s*:?\s*(\d+)', text, re.IGNORECASE)
-        if revision_match:
-            header['revision'] = int(revision_match.group(1))
-        
-        # CPRS number
-        cprs_match = re.search(r'CPRS\s*:?\s*(\d+-[A-Z])', text, re.IGNORECASE)
-        if cprs_match:
-            header['cprs_number'] = cprs_match.group(1)
-        
-        # Dates
-        date_patterns = [
-            (r'ISSUE\s*(?:DATE)?\s*:?\s*([A-Z]{3}\s+\d{1,2},?\s+\d{4})', 'issue_date'),
-            (r'EFFECTIVE\s*(?:DATE)?\s*:?\s*([A-Z]{3}\s+\d{1,2},?\s+\d{4})', 'effective_date'),
-            (r'EXPIR\w*\s*(?:DATE)?\s*:?\s*([A-Z]{3}\s+\d{1,2},?\s+\d{4})', 'expiration_date')
-        ]
-        
-        for pattern, field_name in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                header[field_name] = self._standardize_date(match.group(1))
+        # Scan the upper-cased copy case-sensitively when its offsets line up with the
+        # original (upper() can lengthen a few characters, e.g. 'ß' -> 'SS')
+        if text_upper is not None and len(text_upper) == len(text):
+            matches = _HEADER_UPPER_RE.finditer(text_upper)
+        else:
+            matches = _HEADER_RE.finditer(text)
+        
+        # Single pass over the text; the first occurrence of each field wins
+        for match in matches:
+            field_name = match.lastgroup
+            if field_name in header:
+                continue
+            
+            value = text[match.start(field_name):match.end(field_name)]
+            if field_name == 'revision':
+                header[field_name] = int(value)
+            elif field_name in _DATE_FIELDS:
+                # The header pattern already matched "MON D[,] YYYY"; split it instead of re-matching
+                month, day, year = value.upper().replace(',', ' ').split()
+                header[field_name] = self._standardize_date(month, day, year)
+            else:
+                header[field_name] = value
+            
+            # Stop as soon as every header field has been found
+            if len(header) == _HEADER_RE.groups:
+                break
         
         return header
     
-    def _extract_commodities(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_commodities(self, text: str, text_upper: str, lines: List[str],
+                             line_starts: List[int]) -> List[Dict[str, Any]]:
         """Extract commodity information"""
         commodities = []
         
         # STCC codes (format: XX XXX XX)
-        stcc_pattern = r'(\d{2}\s+\d{3}\s+\d{2})'
-        stcc_matches = re.finditer(stcc_pattern, text)
+        stcc_matches = _STCC_RE.finditer(text)
         
         for match in stcc_matches:
             stcc_code = match.group(1)
             
-            # Find the line containing this STCC code
-            lines = text.split('\n')
-            for line in lines:
-                if stcc_code in line:
-                    name = line.replace(stcc_code, '').strip()
-                    name = re.sub(r'^[^\w]+|[^\w]+$', '', name)
-                    
-                    if name and len(name) > 3:
-                        commodities.append({
-                            'name': name,
-                            'stcc_code': stcc_code.replace(' ', ''),
-                            'description': line.strip()
-                        })
-                    break
-        
-        # Common commodity keywords
-        commodity_keywords = ['WHEAT', 'GRAIN', 'CORN', 'SOYBEAN', 'BARLEY', 'CANOLA']
-        for keyword in commodity_keywords:
-            if keyword in text.upper() and not any(keyword.lower() in c['name'].lower() for c in commodities):
+            # Look up the line containing this STCC code by its offset
+            line = lines[bisect_right(line_starts, match.start()) - 1]
+            if stcc_code not in line:
+                continue  # Code is wrapped across a line break
+            
+            name = line.replace(stcc_code, '').strip()
+            name = _EDGE_PUNCTUATION_RE.sub('', name)
+            
+            if name and len(name) > 3:
+                commodities.append({
+                    'name': name,
+                    'stcc_code': stcc_code.replace(' ', ''),
+                    'description': line.strip()
+                })
+        
+        # Common commodity keywords (found with one scan of the document)
+        found_keywords = set(_COMMODITY_KEYWORDS_RE.findall(text_upper))
+        names_lower = [c['name'].lower() for c in commodities]
+        for keyword in _COMMODITY_KEYWORDS:
+            if keyword in found_keywords and not any(keyword.lower() in name for name in names_lower):
+                names_lower.append(keyword.lower())
                 commodities.append({
                     'name': keyword.title(),
                     'stcc_code': '',
@@ -309,31 +418,47 @@ Return only valid JSON, no additional text."""
         
         return commodities
     
-    def _extract_rates(self, text: str) -> List[Dict[str, Any]]:
-        """Extract rate information"""
+    def _extract_rates_and_notes(self, text: str, text_upper: str, lines: List[str],
+                                 line_starts: List[int]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Extract rate information and notes/provisions in one pass over the candidate lines"""
         rates = []
-        lines = text.split('\n')
+        notes = []
+        
+        # Find rate and note candidates with one scan of the text each, then visit only those lines
+        rate_line_nums = {bisect_right(line_starts, match.start()) - 1
+                          for match in _RATE_LINE_RE.finditer(text)}
+        if len(text_upper) == len(text):
+            note_matches = _NOTE_LINE_UPPER_RE.finditer(text_upper)
+        else:
+            note_matches = _NOTE_LINE_RE.finditer(text)
+        note_line_nums = {bisect_right(line_starts, match.start()) - 1 for match in note_matches}
         
-        for line in lines:
-            line = line.strip()
-            if not line or len(line) < 10:
+        for line_num in sorted(rate_line_nums | note_line_nums):
+            line = lines[line_num].strip()
+            if not line or len(line) < 5:
                 continue
             
-            if '$' in line or re.search(r'\d+\.\d{2}', line):
+            if line_num in rate_line_nums and len(line) >= 10:
                 rate_info = self._parse_rate_line(line)
                 if rate_info:
                     rates.append(rate_info)
+            
+            if line_num in note_line_nums:
+                note_info = self._parse_note_line(line, line_num)
+                if note_info:
+                    notes.append(note_info)
         
-        return rates
+        return rates, notes
     
     def _parse_rate_line(self, line: str) -> Optional[Dict[str, Any]]:
         """Parse a single line for rate information"""
         # Extract rate amount
-        rate_match = re.search(r'\$?(\d+\.\d{2})', line)
+        rate_match = _RATE_AMOUNT_RE.search(line)
         if not rate_match:
             return None
         
         rate_amount = rate_match.group(1)
+        line_upper = line.upper()
         
         # Extract locations
         origin, destination = self._extract_locations_from_line(line)
@@ -348,25 +473,23 @@ Return only valid JSON, no additional text."""
             'rate_amount': rate_amount,
             'currency': 'USD',
             'rate_category': 'standard',
-            'train_type': self._extract_train_type(line),
-            'equipment_type': self._extract_equipment_type(line),
+            'train_type': self._extract_train_type(line_upper),
+            'equipment_type': self._extract_equipment_type(line_upper),
             'route_code': self._extract_route_code(line)
         }
     
     def _extract_locations_from_line(self, line: str) -> Tuple[str, str]:
         """Extract origin and destination from a line"""
         # Pattern: CITY ST to CITY ST
-        to_pattern = r'([A-Z][A-Za-z\s]+[A-Z]{2})\s+(?:to|TO)\s+([A-Z][A-Za-z\s]+[A-Z]{2})'
-        match = re.search(to_pattern, line)
+        match = _TO_LOCATIONS_RE.search(line)
         if match:
             return match.group(1).strip(), match.group(2).strip()
         
-        # Pattern: Multiple locations with state codes
-        location_pattern = r'([A-Z][A-Za-z\s]+\s+[A-Z]{2})'
-        locations = re.findall(location_pattern, line)
+        # Pattern: Multiple locations with state codes (only the first two are used)
+        locations = list(islice(_LOCATION_RE.finditer(line), 2))
         
         if len(locations) >= 2:
-            return locations[0].strip(), locations[1].strip()
+            return locations[0].group(1).strip(), locations[1].group(1).strip()
         
         return '', ''
     
@@ -382,53 +505,29 @@ Return only valid JSON, no additional text."""
         
         return ''
     
-    def _extract_train_type(self, line: str) -> str:
-        """Extract train type from line"""
-        train_types = ['SINGLE CAR', 'UNIT TRAIN', '25 CAR', '50 CAR', '100 CAR', 'LOW CAP', 'HIGH CAP']
-        line_upper = line.upper()
-        for train_type in train_types:
+    def _extract_train_type(self, line_upper: str) -> str:
+        """Extract train type from an upper-cased line"""
+        for train_type in _TRAIN_TYPES:
             if train_type in line_upper:
                 return train_type
         return ''
     
-    def _extract_equipment_type(self, line: str) -> str:
-        """Extract equipment type from line"""
-        equipment_types = ['COVERED HOPPER', 'GONDOLA', 'TANK CAR', 'BOXCAR']
-        line_upper = line.upper()
-        for equipment in equipment_types:
+    def _extract_equipment_type(self, line_upper: str) -> str:
+        """Extract equipment type from an upper-cased line"""
+        for equipment in _EQUIPMENT_TYPES:
             if equipment in line_upper:
                 return equipment
         return ''
     
     def _extract_route_code(self, line: str) -> str:
         """Extract route code from line"""
-        route_patterns = [r'CP(\d{3,4})', r'ROUTE\s*:?\s*(\d{3,4})', r'\b(\d{4})\b']
-        for pattern in route_patterns:
-            match = re.search(pattern, line, re.IGNORECASE)
-            if match:
-                return match.group(1) if match.groups() else match.group(0)
-        return ''
-    
-    def _extract_notes(self, text: str) -> List[Dict[str, Any]]:
-        """Extract notes and provisions"""
-        notes = []
-        lines = text.split('\n')
-        
-        for line_num, line in enumerate(lines):
-            line = line.strip()
-            if not line or len(line) < 5:
-                continue
-            
-            note_info = self._parse_note_line(line, line_num)
-            if note_info:
-                notes.append(note_info)
-        
-        return notes
+        match = _ROUTE_CODE_RE.match(line)
+        return match.group(match.lastgroup) if match else ''
     
     def _parse_note_line(self, line: str, line_num: int) -> Optional[Dict[str, Any]]:
         """Parse a line for note content"""
         # Numbered notes
-        numbered_match = re.match(r'^(\d+)\.?\s*(.+)', line)
+        numbered_match = _NUMBERED_NOTE_RE.match(line)
         if numbered_match:
             return {
                 'type': 'NUMBERED',
@@ -444,9 +543,8 @@ Return only valid JSON, no additional text."""
                 'text': line[1:].strip()
             }
         
-        # Provision keywords
-        provision_keywords = ['SUBJECT TO', 'APPLIES', 'MINIMUM', 'MAXIMUM', 'EQUIPMENT']
-        if any(keyword in line.upper() for keyword in provision_keywords):
+        # Provision keywords (case-insensitive scan, no upper-cased copy of the line)
+        if _PROVISION_KEYWORDS_RE.search(line):
             return {
                 'type': 'PROVISION',
                 'code': '',
@@ -455,53 +553,32 @@ Return only valid JSON, no additional text."""
         
         return None
     
-    def _extract_locations(self, text: str) -> Tuple[str, str]:
+    def _extract_locations(self, text: str, text_upper: str) -> Tuple[str, str]:
         """Extract primary origin and destination"""
-        # FROM...TO pattern
-        from_to_match = re.search(r'FROM\s+([^TO\n]+)\s+TO\s+([^\n]+)', text, re.IGNORECASE)
-        if from_to_match:
-            return from_to_match.group(1).strip(), from_to_match.group(2).strip()
-        
-        # Common locations
-        canadian_cities = ['VANCOUVER BC', 'CALGARY AB', 'WINNIPEG MB', 'TORONTO ON']
-        us_cities = ['CHICAGO IL', 'MINNEAPOLIS MN', 'KANSAS CITY MO']
-        
-        origin = destination = ''
-        for city in canadian_cities:
-            if city in text.upper():
-                origin = city.title()
-                break
+        # FROM...TO pattern; the substring test skips a case-insensitive scan of documents without one
+        if 'FROM' in text_upper:
+            from_to_match = _FROM_TO_RE.search(text)
+            if from_to_match:
+                return from_to_match.group(1).strip(), from_to_match.group(2).strip()
         
-        for city in us_cities:
-            if city in text.upper():
-                destination = city.title()
-                break
+        # Common locations: one scan per city list, earlier list entries take priority
+        canadian_found = set(_CANADIAN_CITIES_RE.findall(text_upper))
+        us_found = set(_US_CITIES_RE.findall(text_upper))
+        
+        origin = next((city.title() for city in _CANADIAN_CITIES if city in canadian_found), '')
+        destination = next((city.title() for city in _US_CITIES if city in us_found), '')
         
         return origin, destination
     
-    def _determine_currency(self, text: str) -> str:
-        """Determine currency from document text"""
-        if re.search(r'CAD|CANADIAN|C\$', text, re.IGNORECASE):
+    def _determine_currency(self, text_upper: str) -> str:
+        """Determine currency from uppercased document text"""
+        if any(marker in text_upper for marker in _CAD_MARKERS):
             return 'CAD'
         return 'USD'
     
-    def _standardize_date(self, date_str: str) -> str:
-        """Convert date string to YYYY-MM-DD format"""
-        month_map = {
-            'JAN': '01', 'FEB': '02', 'MAR': '03', 'APR': '04',
-            'MAY': '05', 'JUN': '06', 'JUL': '07', 'AUG': '08',
-            'SEP': '09', 'OCT': '10', 'NOV': '11', 'DEC': '12'
-        }
-        
-        # Handle "JUL 22, 2024" format
-        match = re.search(r'(\w{3})\s+(\d{1,2}),?\s+(\d{4})', date_str.upper())
-        if match:
-            month = month_map.get(match.group(1), '01')
-            day = match.group(2).zfill(2)
-            year = match.group(3)
-            return f"{year}-{month}-{day}"
-        
-        return date_str
+    def _standardize_date(self, month: str, day: str, year: str) -> str:
+        """Convert matched date parts (e.g. "JUL", "22", "2024") to YYYY-MM-DD format"""
+        return f"{year}-{_MONTH_NUMBERS.get(month, '01')}-{day.zfill(2)}"
     
     def _merge_extraction_results(self, rule_based: Dict, ai_enhanced: Dict) -> Dict[str, Any]:
         """Merge rule-based and AI extraction results intelligently"""
@@ -524,7 +601,7 @@ Return only valid JSON, no additional text."""
         
         # Combine notes (remove duplicates)
         if 'notes' in ai_enhanced:
-            existing_notes = [note['text'] for note in merged['notes']]
+            existing_notes = {note['text'] for note in merged['notes']}
             for note in ai_enhanced['notes']:
                 if note['text'] not in existing_notes:
                     merged['notes'].append(note)
@@ -544,18 +621,16 @@ Return only valid JSON, no additional text."""
     
     def _create_metadata(self, text: str, filename: str, file_size: int, extraction_method: str) -> Dict[str, Any]:
         """Create processing metadata"""
-        lines = text.split('\n')
-        
         return {
             'filename': filename,
             'file_size_bytes': file_size,
-            'total_lines': len(lines),
-            'non_empty_lines': len([line for line in lines if line.strip()]),
+            'total_lines': text.count('\n') + 1,
+            'non_empty_lines': len(_NON_EMPTY_LINE_RE.findall(text)),
             'text_length': len(text),
             'processing_timestamp': datetime.now().isoformat(),
             'extraction_method': extraction_method,
             'ai_enhancement_used': self.ai_available,
-            'tables_found': text.count('TABLE') + text.count('ORIGIN') + text.count('DESTINATION')
+            'tables_found': len(_TABLE_MARKER_RE.findall(text))
         }
     
     def _empty_result(self, filename: str, file_size: int) -> Dict[str, Any]:
@@ -7,8 +7,15 @@ import os
 import re
 import fitz  # PyMuPDF
 import logging
-import io
-from typing import Dict, List, Any, Optional
+import hashlib
+import queue
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Dict, List, Any, Optional, FrozenSet, Tuple
 from pathlib import Path
 
 # Tesseract OCR
@@ -24,15 +31,162 @@ try:
 except ImportError:
     TESSERACT_AVAILABLE = False
 
+# In-process Tesseract bindings (no subprocess per page)
+try:
+    from tesserocr import PyTessBaseAPI, PSM
+    from PIL import Image
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
 # PaddleOCR
 try:
     from paddleocr import PaddleOCR
+    import numpy as np
     PADDLE_AVAILABLE = True
 except ImportError:
     PADDLE_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Pages whose text layer is this short are treated as scanned and OCR'd
+MIN_PAGE_TEXT_CHARS = 50
+
+# Text-layer extraction flags: no image blocks and no ligature preservation,
+# which the parsers never use and which cost extra work per page
+TEXT_LAYER_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+
+# Upper bound on worker processes used to Tesseract-OCR scanned pages in parallel
+MAX_CONCURRENT_OCR = int(os.getenv("MAX_CONCURRENT_OCR", os.cpu_count() or 1))
+
+# Seconds allowed per page (per worker) before a parallel OCR pass is abandoned
+OCR_PAGE_TIMEOUT = int(os.getenv("OCR_PAGE_TIMEOUT", "120"))
+
+# Pages rendered ahead of the page currently being OCRed
+OCR_RENDER_AHEAD = 2
+
+# Extracted text of recently processed PDFs, keyed by file content and enabled engines
+PDF_TEXT_CACHE_SIZE = 64
+_pdf_text_cache: "OrderedDict[tuple, str]" = OrderedDict()
+
+# OCR text of recently seen page images, keyed by pixel content and enabled engines
+PAGE_OCR_CACHE_SIZE = 256
+_page_ocr_cache: "OrderedDict[tuple, str]" = OrderedDict()
+
+# Outcome of the last PaddleOCR model load in this process (None until one is attempted)
+_paddle_models_loaded: Optional[bool] = None
+
+# Tesseract worker pool shared by all requests, started on first use
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+_ocr_pool_lock = threading.Lock()
+
+# Tesseract handle owned by each OCR pool worker process
+_worker_tess_api = None
+
+def _render_page(page, gray: bool = False) -> "fitz.Pixmap":
+    """Render a PDF page to an RGB (or grayscale, for Tesseract only) pixmap for OCR"""
+    mat = fitz.Matrix(2.0, 2.0)  # 2x zoom for better OCR
+    colorspace = fitz.csGRAY if gray else fitz.csRGB
+    return page.get_pixmap(matrix=mat, colorspace=colorspace, alpha=False)
+
+def _pixel_key(pix: "fitz.Pixmap") -> tuple:
+    """Identify a rendered page by its pixel content"""
+    return (hashlib.blake2b(pix.samples_mv, digest_size=16).digest(), pix.width, pix.height)
+
+def _remember_page_text(cache_key: tuple, text: str) -> None:
+    """Store a page's OCR text, evicting the least recently used page"""
+    _page_ocr_cache[cache_key] = text
+    if len(_page_ocr_cache) > PAGE_OCR_CACHE_SIZE:
+        _page_ocr_cache.popitem(last=False)
+
+def _pixmap_to_image(pix: "fitz.Pixmap") -> "Image.Image":
+    """Wrap a pixmap's raw samples as a PIL image without encoding it"""
+    mode = "L" if pix.n == 1 else "RGB"
+    return Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+
+def _tesseract_image_to_text(image, tess_api=None) -> str:
+    """Run Tesseract on an image, in-process when an API handle is available"""
+    if tess_api is not None:
+        tess_api.SetImage(image)
+        return tess_api.GetUTF8Text()
+    
+    return pytesseract.image_to_string(
+        image,
+        lang='eng',
+        config='--psm 6'  # Single uniform block
+    )
+
+def _paddle_gpu_available() -> bool:
+    """Whether Paddle was built with CUDA and can see a GPU"""
+    try:
+        import paddle
+        return paddle.device.is_compiled_with_cuda() and paddle.device.cuda.device_count() > 0
+    except Exception:
+        return False
+
+def _tesseract_ocr_worker(pdf_path: str, known_pages: FrozenSet[tuple], page_num: int) -> Tuple[tuple, Optional[str]]:
+    """OCR one PDF page with Tesseract inside a pool worker process
+    
+    Returns the page's pixel key and its text. The text is None when the
+    parent process already has that page in its OCR cache, or when
+    Tesseract failed on it.
+    """
+    global _worker_tess_api
+    
+    if TESSEROCR_AVAILABLE and _worker_tess_api is None:
+        try:
+            _worker_tess_api = PyTessBaseAPI(psm=PSM.SINGLE_BLOCK, lang='eng')
+        except Exception:
+            _worker_tess_api = None
+    
+    doc = fitz.open(pdf_path)
+    try:
+        pix = _render_page(doc.load_page(page_num), gray=True)
+    finally:
+        doc.close()
+    
+    pixel_key = _pixel_key(pix)
+    if pixel_key in known_pages:
+        return pixel_key, None
+    
+    try:
+        return pixel_key, _tesseract_image_to_text(_pixmap_to_image(pix), _worker_tess_api)
+    except Exception as e:
+        logger.error(f"Tesseract OCR failed on page {page_num + 1}: {e}")
+        return pixel_key, None
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    """Return the shared Tesseract worker pool, starting it on first use"""
+    global _ocr_pool
+    
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            # Keep Tesseract single-threaded in the workers so they don't oversubscribe cores.
+            # libgomp reads this only when it loads, which in a worker is while the first task
+            # imports this module, so it must be in the environment workers are spawned with
+            # (this process loaded libgomp at import; later pytesseract subprocesses inherit it)
+            os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+            # Spawned rather than forked: a child forked mid-OpenMP can deadlock in libgomp
+            _ocr_pool = ProcessPoolExecutor(
+                max_workers=MAX_CONCURRENT_OCR,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _ocr_pool
+
+def _discard_ocr_pool(pool: ProcessPoolExecutor) -> None:
+    """Tear down a hung or broken pool so the next request starts a fresh one"""
+    global _ocr_pool
+    
+    with _ocr_pool_lock:
+        if _ocr_pool is pool:
+            _ocr_pool = None
+    
+    # shutdown() can't stop a task that is already running, so stuck workers are killed
+    workers = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for worker in workers:
+        worker.terminate()
+
 class OCREngine:
     """Production OCR engine with PaddleOCR and Tesseract support"""
     
@@ -45,30 +199,35 @@ class OCREngine:
             use_tesseract: Enable Tesseract OCR (good for simple text)
         """
         self.use_paddle = use_paddle and PADDLE_AVAILABLE
-        self.use_tesseract = use_tesseract and TESSERACT_AVAILABLE
+        self.use_tesseract = use_tesseract and (TESSERACT_AVAILABLE or TESSEROCR_AVAILABLE)
         
-        # Initialize PaddleOCR if available
-        if self.use_paddle:
-            try:
-                self.paddle_ocr = PaddleOCR(
-                    use_angle_cls=True,
-                    lang='en',
-                    use_gpu=False,  # Set to True if GPU available
-                    show_log=False
-                )
-                logger.info("PaddleOCR initialized successfully")
-            except Exception as e:
-                logger.warning(f"PaddleOCR initialization failed: {e}")
-                self.use_paddle = False
+        # OCR engines are started on first use, so PDFs with a text layer never pay for them
+        self.paddle_ocr = None
+        self.tess_api = None
         
         if not (self.use_paddle or self.use_tesseract):
             logger.error("No OCR engines available")
         else:
             logger.info(f"OCR engine initialized - PaddleOCR: {self.use_paddle}, Tesseract: {self.use_tesseract}")
     
+    def __enter__(self) -> "OCREngine":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Release the in-process Tesseract engine"""
+        if self.tess_api is not None:
+            self.tess_api.End()
+            self.tess_api = None
+    
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """
-        Extract text from PDF using multiple methods
+        Extract text from PDF, choosing the method page by page
+        
+        Pages with a usable text layer are read directly; only image-only
+        (scanned) pages are sent through OCR.
         
         Args:
             pdf_path: Path to PDF file
@@ -78,147 +237,286 @@ class OCREngine:
         """
         logger.info(f"Extracting text from: {pdf_path}")
         
-        # Method 1: Try direct text extraction from PDF
-        pdf_text = self._extract_pdf_text_layer(pdf_path)
-        
-        if pdf_text and len(pdf_text.strip()) > 100:
-            logger.info(f"Extracted {len(pdf_text)} characters from PDF text layer")
-            return pdf_text
-        
-        # Method 2: OCR if no text layer or insufficient text
-        logger.info("PDF has minimal text layer, attempting OCR")
-        ocr_text = self._perform_ocr(pdf_path)
-        
-        if ocr_text:
-            logger.info(f"Extracted {len(ocr_text)} characters via OCR")
-            return ocr_text
+        # Re-uploads of the same file skip text extraction and OCR entirely
+        pdf_digest = self._pdf_digest(pdf_path)
+        cache_key = self._pdf_cache_key(pdf_digest)
+        if cache_key in _pdf_text_cache:
+            _pdf_text_cache.move_to_end(cache_key)
+            logger.info("Using cached text for previously processed PDF")
+            return _pdf_text_cache[cache_key]
         
-        # Fallback
-        logger.warning("Limited text could be extracted from PDF")
-        return pdf_text or ""
-    
-    def _extract_pdf_text_layer(self, pdf_path: str) -> str:
-        """Extract text from PDF text layer using PyMuPDF"""
         try:
             doc = fitz.open(pdf_path)
-            full_text = ""
+        except Exception as e:
+            logger.error(f"Error opening PDF: {e}")
+            return ""
+        
+        ocr_complete = True
+        try:
+            # Method 1: Direct text extraction from each page's text layer
+            page_texts = [self._page_text_layer(doc, page_num) for page_num in range(len(doc))]
+            ocr_page_nums = [
+                page_num for page_num, text in enumerate(page_texts)
+                if len(text.strip()) <= MIN_PAGE_TEXT_CHARS
+            ]
             
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                text = page.get_text()
-                
-                if text.strip():
-                    full_text += f"\n--- Page {page_num + 1} ---\n{text}"
+            # Method 2: OCR only the pages without a usable text layer
+            if ocr_page_nums:
+                self._ensure_paddle_ocr()
             
+            if ocr_page_nums and (self.use_paddle or self.use_tesseract):
+                logger.info(f"{len(ocr_page_nums)} of {len(page_texts)} pages have minimal text layer, attempting OCR")
+                
+                ocr_texts = None
+                if self._can_ocr_in_parallel(len(ocr_page_nums)):
+                    ocr_texts = self._tesseract_ocr_parallel(pdf_path, ocr_page_nums)
+                if ocr_texts is None:
+                    self._ensure_tess_api()
+                    ocr_texts = self._ocr_pages_pipelined(doc, ocr_page_nums)
+                
+                # A blank page is a valid result; only pages OCR couldn't process are incomplete
+                for page_num, ocr_text in zip(ocr_page_nums, ocr_texts):
+                    if ocr_text is None:
+                        ocr_complete = False
+                    elif ocr_text.strip():
+                        page_texts[page_num] = ocr_text
+            elif ocr_page_nums:
+                ocr_complete = False
+        finally:
             doc.close()
-            return full_text
-            
+        
+        full_text = "".join(
+            f"\n--- Page {page_num + 1} ---\n{text}"
+            for page_num, text in enumerate(page_texts)
+            if text.strip()
+        )
+        
+        if full_text:
+            logger.info(f"Extracted {len(full_text)} characters "
+                        f"({len(page_texts) - len(ocr_page_nums)} text-layer pages, {len(ocr_page_nums)} OCR pages)")
+            # Cache only complete results, keyed by the engines actually used (PaddleOCR may
+            # have failed to load), so a transient OCR failure is retried on re-upload
+            cache_key = self._pdf_cache_key(pdf_digest)
+            if cache_key is not None and ocr_complete:
+                _pdf_text_cache[cache_key] = full_text
+                if len(_pdf_text_cache) > PDF_TEXT_CACHE_SIZE:
+                    _pdf_text_cache.popitem(last=False)
+        else:
+            logger.warning("Limited text could be extracted from PDF")
+        
+        return full_text
+    
+    def _pdf_digest(self, pdf_path: str) -> Optional[str]:
+        """Hash the file's content; None if it can't be read"""
+        try:
+            with open(pdf_path, "rb") as pdf_file:
+                return hashlib.sha256(pdf_file.read()).hexdigest()
+        except OSError:
+            return None
+    
+    def _pdf_cache_key(self, pdf_digest: Optional[str]) -> Optional[tuple]:
+        """Build the text cache key from the content hash and the enabled engines"""
+        if pdf_digest is None:
+            return None
+        return (pdf_digest, self.use_paddle, self.use_tesseract)
+    
+    def _ensure_paddle_ocr(self) -> bool:
+        """Load the PaddleOCR models the first time a scanned page needs them"""
+        global _paddle_models_loaded
+        
+        if self.use_paddle and self.paddle_ocr is None:
+            try:
+                use_gpu = _paddle_gpu_available()
+                self.paddle_ocr = PaddleOCR(
+                    use_angle_cls=True,
+                    lang='en',
+                    use_gpu=use_gpu,
+                    enable_mkldnn=not use_gpu,  # oneDNN kernels for CPU inference
+                    cpu_threads=min(10, os.cpu_count() or 1),
+                    show_log=False
+                )
+                _paddle_models_loaded = True
+                logger.info(f"PaddleOCR initialized successfully ({'GPU' if use_gpu else 'CPU/MKLDNN'})")
+            except Exception as e:
+                logger.warning(f"PaddleOCR initialization failed: {e}")
+                _paddle_models_loaded = False
+                self.use_paddle = False
+        
+        return self.use_paddle
+    
+    def _ensure_tess_api(self) -> bool:
+        """Start the in-process Tesseract engine the first time a page needs it"""
+        # One engine is kept alive for all pages; pytesseract is the fallback
+        if self.use_tesseract and TESSEROCR_AVAILABLE and self.tess_api is None:
+            try:
+                self.tess_api = PyTessBaseAPI(psm=PSM.SINGLE_BLOCK, lang='eng')
+                logger.info("Tesseract API initialized successfully")
+            except Exception as e:
+                logger.warning(f"Tesseract API initialization failed, using pytesseract: {e}")
+                self.use_tesseract = TESSERACT_AVAILABLE
+        
+        return self.use_tesseract
+    
+    def _page_text_layer(self, doc, page_num: int) -> str:
+        """Read a page's text layer from its text blocks in reading order"""
+        try:
+            # Block tuples are (x0, y0, x1, y1, text, block_no, block_type); type 1 is an image
+            blocks = doc.load_page(page_num).get_text("blocks", flags=TEXT_LAYER_FLAGS, sort=True)
         except Exception as e:
-            logger.error(f"Error extracting PDF text: {e}")
+            # A broken text layer on one page shouldn't fail the document; OCR it instead
+            logger.error(f"Error extracting text layer from page {page_num + 1}: {e}")
             return ""
+        return "".join(block[4] for block in blocks if block[6] == 0)
+    
+    def _ocr_pages_pipelined(self, doc, page_nums: List[int]) -> List[Optional[str]]:
+        """OCR pages in order while the following pages render on a background thread
+        
+        A page's text is None when it couldn't be rendered or recognised.
+        """
+        rendered = queue.Queue(maxsize=OCR_RENDER_AHEAD)
+        # Set when the consumer stops early so the renderer never blocks on a full queue
+        stop = threading.Event()
+        # PaddleOCR needs colour input; Tesseract binarises anyway, so a third of the pixels will do
+        gray = not self.use_paddle
+        
+        def render_pages():
+            # Only this thread touches the document until it is joined
+            for page_num in page_nums:
+                if stop.is_set():
+                    return
+                try:
+                    pix = _render_page(doc.load_page(page_num), gray=gray)
+                except Exception as e:
+                    logger.error(f"Rendering failed on page {page_num + 1}: {e}")
+                    pix = None
+                while not stop.is_set():
+                    try:
+                        rendered.put(pix, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+        
+        renderer = threading.Thread(target=render_pages, name="ocr-page-renderer", daemon=True)
+        renderer.start()
+        
+        ocr_texts = []
+        try:
+            for page_num in page_nums:
+                pix = rendered.get()
+                ocr_texts.append(self._ocr_page(pix, page_num) if pix is not None else None)
+        finally:
+            stop.set()
+            renderer.join()
+        
+        return ocr_texts
+    
+    def _ocr_page(self, pix: "fitz.Pixmap", page_num: int) -> Optional[str]:
+        """OCR a single rendered page, reusing the text of an identical page seen before"""
+        # Boilerplate pages repeat across tariff revisions; hashing is cheap next to OCR
+        cache_key = _pixel_key(pix) + (self.use_paddle, self.use_tesseract)
+        if cache_key in _page_ocr_cache:
+            _page_ocr_cache.move_to_end(cache_key)
+            logger.info(f"Using cached OCR text for page {page_num + 1}")
+            return _page_ocr_cache[cache_key]
+        
+        # Blank pages are cached too; only failures are retried
+        text = self._recognize_page(pix, page_num)
+        if text is not None:
+            _remember_page_text(cache_key, text)
+        
+        return text
     
-    def _perform_ocr(self, pdf_path: str) -> str:
-        """Perform OCR on PDF pages using available engines"""
+    def _recognize_page(self, pix: "fitz.Pixmap", page_num: int) -> Optional[str]:
+        """Run OCR on a rendered page, trying PaddleOCR first and falling back to Tesseract
+        
+        Returns None when no engine got through the page without an error.
+        """
+        paddle_text = None
         
         # Try PaddleOCR first (generally more accurate for complex layouts)
         if self.use_paddle:
-            paddle_text = self._paddle_ocr_extract(pdf_path)
-            if paddle_text and len(paddle_text.strip()) > 50:
-                return paddle_text
+            try:
+                paddle_text = self._paddle_ocr_page(pix, page_num)
+                if len(paddle_text.strip()) > MIN_PAGE_TEXT_CHARS:
+                    return paddle_text
+            except Exception as e:
+                logger.error(f"PaddleOCR failed on page {page_num + 1}: {e}")
         
         # Fallback to Tesseract
         if self.use_tesseract:
-            tesseract_text = self._tesseract_ocr_extract(pdf_path)
-            if tesseract_text:
-                return tesseract_text
+            try:
+                tesseract_text = self._tesseract_ocr_page(pix, page_num)
+                if tesseract_text.strip() or paddle_text is None:
+                    return tesseract_text
+            except Exception as e:
+                logger.error(f"Tesseract OCR failed on page {page_num + 1}: {e}")
         
-        logger.error("All OCR methods failed")
-        return ""
+        return paddle_text
     
-    def _paddle_ocr_extract(self, pdf_path: str) -> str:
-        """Extract text using PaddleOCR"""
-        try:
-            logger.info("Starting PaddleOCR extraction")
-            doc = fitz.open(pdf_path)
-            full_text = ""
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                
-                # Convert page to image
-                mat = fitz.Matrix(2.0, 2.0)  # 2x zoom for better OCR
-                pix = page.get_pixmap(matrix=mat)
-                img_data = pix.tobytes("png")
-                
-                # Save image temporarily for PaddleOCR
-                temp_img_path = f"temp_page_{page_num}.png"
-                with open(temp_img_path, "wb") as f:
-                    f.write(img_data)
-                
-                try:
-                    # Run PaddleOCR
-                    result = self.paddle_ocr.ocr(temp_img_path, cls=True)
-                    
-                    # Extract text from results
-                    page_text = ""
-                    if result and result[0]:
-                        for line in result[0]:
-                            if len(line) > 1 and line[1][1] > 0.5:  # Confidence threshold
-                                page_text += line[1][0] + " "
-                    
-                    if page_text.strip():
-                        full_text += f"\n--- Page {page_num + 1} ---\n{page_text}"
-                
-                finally:
-                    # Clean up temp image
-                    if os.path.exists(temp_img_path):
-                        os.unlink(temp_img_path)
-            
-            doc.close()
-            logger.info(f"PaddleOCR extracted {len(full_text)} characters")
-            return full_text
-            
-        except Exception as e:
-            logger.error(f"PaddleOCR extraction failed: {e}")
-            return ""
+    def _can_ocr_in_parallel(self, page_count: int) -> bool:
+        """Whether scanned pages can be spread over a Tesseract process pool"""
+        # PaddleOCR models live in this process, so only the Tesseract-only path is pooled
+        return (not self.use_paddle and self.use_tesseract
+                and page_count > 1 and MAX_CONCURRENT_OCR > 1)
     
-    def _tesseract_ocr_extract(self, pdf_path: str) -> str:
-        """Extract text using Tesseract OCR"""
-        if not TESSERACT_AVAILABLE:
-            logger.error("Tesseract not available for OCR")
-            return ""
+    def _tesseract_ocr_parallel(self, pdf_path: str, page_nums: List[int]) -> Optional[List[Optional[str]]]:
+        """OCR pages with Tesseract across worker processes, preserving page order
+        
+        Returns None if the pool failed, otherwise one text per page, None for a failed page.
+        """
+        engines = (self.use_paddle, self.use_tesseract)
+        # Workers render every page but skip OCR for pages already in this process's cache
+        known_pages = frozenset(key[:3] for key in _page_ocr_cache if key[3:] == engines)
+        timeout = OCR_PAGE_TIMEOUT * -(-len(page_nums) // MAX_CONCURRENT_OCR)
         
+        pool = _get_ocr_pool()
         try:
-            logger.info("Starting Tesseract OCR extraction")
-            doc = fitz.open(pdf_path)
-            full_text = ""
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                
-                # Convert page to image
-                mat = fitz.Matrix(2.0, 2.0)  # 2x zoom for better OCR
-                pix = page.get_pixmap(matrix=mat)
-                img_data = pix.tobytes("png")
-                
-                # OCR the image
-                image = Image.open(io.BytesIO(img_data))
-                page_text = pytesseract.image_to_string(
-                    image,
-                    lang='eng',
-                    config='--psm 6'  # Single uniform block
-                )
-                
-                if page_text.strip():
-                    full_text += f"\n--- Page {page_num + 1} ---\n{page_text}"
-            
-            doc.close()
-            logger.info(f"Tesseract extracted {len(full_text)} characters")
-            return full_text
-            
+            results = list(pool.map(
+                partial(_tesseract_ocr_worker, pdf_path, known_pages), page_nums, timeout=timeout
+            ))
+        except (TimeoutError, BrokenProcessPool) as e:
+            logger.warning(f"Parallel Tesseract OCR stalled, falling back to sequential: {e!r}")
+            _discard_ocr_pool(pool)
+            return None
         except Exception as e:
-            logger.error(f"Tesseract OCR extraction failed: {e}")
+            logger.warning(f"Parallel Tesseract OCR failed, falling back to sequential: {e}")
+            return None
+        
+        ocr_texts = []
+        for page_num, (pixel_key, text) in zip(page_nums, results):
+            cache_key = pixel_key + engines
+            if text is None:
+                # Either a cache hit or a failed page; a failure stays None
+                text = _page_ocr_cache.get(cache_key)
+                if text is not None:
+                    _page_ocr_cache.move_to_end(cache_key)
+                    logger.info(f"Using cached OCR text for page {page_num + 1}")
+            else:
+                _remember_page_text(cache_key, text)
+            ocr_texts.append(text)
+        
+        return ocr_texts
+    
+    def _paddle_ocr_page(self, pix: "fitz.Pixmap", page_num: int) -> str:
+        """OCR a single rendered page with PaddleOCR"""
+        # PaddleOCR takes BGR arrays directly, so the page never goes through PNG or disk
+        rgb = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+        result = self.paddle_ocr.ocr(np.ascontiguousarray(rgb[:, :, ::-1]), cls=True)
+        
+        # Extract text from results
+        if not (result and result[0]):
             return ""
+        
+        return "".join(
+            line[1][0] + " "
+            for line in result[0]
+            if len(line) > 1 and line[1][1] > 0.5  # Confidence threshold
+        )
+    
+    def _tesseract_ocr_page(self, pix: "fitz.Pixmap", page_num: int) -> str:
+        """OCR a single rendered page with Tesseract"""
+        image = _pixmap_to_image(pix)
+        return _tesseract_image_to_text(image, self.tess_api)
     
     def extract_tables_from_pdf(self, pdf_path: str) -> List[Dict[str, Any]]:
         """
@@ -268,10 +566,12 @@ class OCREngine:
         
         return tables
     
-    def get_ocr_capabilities(self) -> Dict[str, bool]:
+    def get_ocr_capabilities(self) -> Dict[str, Optional[bool]]:
         """Get available OCR capabilities"""
         return {
             "paddle_ocr": self.use_paddle,
+            # Models load on the first scanned page, so this is None until this process has OCR'd one
+            "paddle_ocr_loaded": _paddle_models_loaded,
             "tesseract": self.use_tesseract,
             "pdf_text_layer": True,
             "table_extraction": True
@@ -308,9 +608,8 @@ class OCREngine:
             
             # Check if document has text layer
             for page_num in range(min(3, len(doc))):  # Check first 3 pages
-                page = doc.load_page(page_num)
-                text = page.get_text()
-                if text and len(text.strip()) > 50:
+                text = self._page_text_layer(doc, page_num)
+                if len(text.strip()) > MIN_PAGE_TEXT_CHARS:
                     metadata["has_text_layer"] = True
                     break
             
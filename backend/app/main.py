@@ -107,15 +107,23 @@ async def health_check():
     
     # Test OCR engines
     try:
-        ocr_engine = OCREngine()
-        ocr_capabilities = ocr_engine.get_ocr_capabilities()
+        with OCREngine() as ocr_engine:
+            ocr_capabilities = ocr_engine.get_ocr_capabilities()
+        paddle_loaded = ocr_capabilities.get("paddle_ocr_loaded")
+        if paddle_loaded is None:
+            paddle_models = "not loaded yet"
+        else:
+            paddle_models = "loaded" if paddle_loaded else "failed to load"
+        
         health_status["checks"]["ocr_engines"] = {
             "paddle_ocr": ocr_capabilities.get("paddle_ocr", False),
+            "paddle_ocr_models": paddle_models,
             "tesseract": ocr_capabilities.get("tesseract", False),
             "pdf_text_layer": ocr_capabilities.get("pdf_text_layer", True)
         }
         
-        if not any([ocr_capabilities.get("paddle_ocr"), ocr_capabilities.get("tesseract")]):
+        paddle_usable = ocr_capabilities.get("paddle_ocr") and paddle_loaded is not False
+        if not any([paddle_usable, ocr_capabilities.get("tesseract")]):
             health_status["status"] = "degraded"
             
     except Exception as e:
@@ -180,8 +188,8 @@ async def process_tariff_document(
         
         # OCR Processing
         logger.info("Starting OCR extraction")
-        ocr_engine = OCREngine(use_paddle=True, use_tesseract=True)
-        raw_ocr_data = ocr_engine.extract_text_from_pdf(str(temp_path))
+        with OCREngine(use_paddle=True, use_tesseract=True) as ocr_engine:
+            raw_ocr_data = ocr_engine.extract_text_from_pdf(str(temp_path))
         
         # AI-Enhanced Data Processing
         logger.info("Processing extracted data with AI enhancement")
@@ -5,10 +5,42 @@ Cleans up development files and prepares for production deployment.
 """
 
 import os
+import glob
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# Linux ioctl sharing a file's extents copy-on-write (btrfs/XFS reflink)
+FICLONE = 0x40049409
+
+def clone_file(source: Path, dest: Path):
+    """Reflink source to dest where the filesystem supports it, else copy the bytes"""
+    if FCNTL_AVAILABLE:
+        with open(source, 'rb') as src, open(dest, 'wb') as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return
+            except OSError:
+                pass  # Cross-device or no reflink support
+    shutil.copyfile(source, dest)
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write content unless the file already holds it; True if the file was written"""
+    try:
+        if path.read_text(encoding='utf-8') == content:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_text(content, encoding='utf-8')
+    return True
+
 class ProductionDeployer:
     """Handles production deployment tasks"""
     
@@ -31,15 +63,25 @@ class ProductionDeployer:
             "backend/requirements.txt"
         ]
         
-        for file_path in backup_files:
-            source = self.project_root / file_path
-            if source.exists():
-                dest = self.backup_dir / source.name
-                shutil.copy2(source, dest)
+        # Copies are independent and IO-bound; report them in list order afterwards
+        with ThreadPoolExecutor(max_workers=min(4, len(backup_files))) as executor:
+            copied = list(executor.map(self._backup_file, backup_files))
+        
+        for file_path, ok in zip(backup_files, copied):
+            if ok:
                 print(f"   ✅ Backed up: {file_path}")
         
         print(f"✅ Backup completed: {self.backup_dir}")
     
+    def _backup_file(self, file_path: str) -> bool:
+        """Copy one file into the backup directory; False if it doesn't exist"""
+        source = self.project_root / file_path
+        try:
+            clone_file(source, self.backup_dir / source.name)
+        except FileNotFoundError:
+            return False
+        return True
+    
     def remove_development_files(self):
         """Remove development and test files"""
         print("\n🧹 Removing development files...")
@@ -82,33 +124,30 @@ class ProductionDeployer:
         for pattern in files_to_remove:
             pattern_path = self.project_root / pattern
             
-            # Handle glob patterns
+            # Glob patterns expand to existing paths only (an absent parent yields no matches)
             if '*' in pattern:
-                parent = pattern_path.parent
-                if parent.exists():
-                    import glob
-                    matches = glob.glob(str(pattern_path))
-                    for match in matches:
-                        match_path = Path(match)
-                        if match_path.exists():
-                            if match_path.is_file():
-                                match_path.unlink()
-                            elif match_path.is_dir():
-                                shutil.rmtree(match_path)
-                            print(f"   🗑️  Removed: {match}")
-                            removed_count += 1
+                targets = [(Path(match), match) for match in glob.glob(str(pattern_path))]
             else:
-                # Handle specific files/directories
-                if pattern_path.exists():
-                    if pattern_path.is_file():
-                        pattern_path.unlink()
-                    elif pattern_path.is_dir():
-                        shutil.rmtree(pattern_path)
-                    print(f"   🗑️  Removed: {pattern}")
+                targets = [(pattern_path, pattern)]
+            
+            for target, label in targets:
+                if self._remove_path(target):
+                    print(f"   🗑️  Removed: {label}")
                     removed_count += 1
         
         print(f"✅ Removed {removed_count} development files")
     
+    def _remove_path(self, path: Path) -> bool:
+        """Remove a file or directory tree with a single stat; False if it doesn't exist"""
+        try:
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+        except FileNotFoundError:
+            return False
+        return True
+    
     def create_production_structure(self):
         """Create clean production file structure"""
         print("\n📁 Creating production file structure...")
@@ -136,9 +175,12 @@ class ProductionDeployer:
         
         for init_file in init_files:
             init_path = self.project_root / init_file
-            if not init_path.exists():
-                init_path.write_text("")
-                print(f"   📄 Created: {init_file}")
+            # Exclusive create replaces the exists() pre-check
+            try:
+                init_path.open('x').close()
+            except FileExistsError:
+                continue
+            print(f"   📄 Created: {init_file}")
     
     def create_production_env(self):
         """Create production environment file"""
@@ -167,8 +209,10 @@ TESSERACT_CMD=tesseract
 """
         
         env_path = self.project_root / "backend" / ".env"
-        env_path.write_text(env_content)
-        print(f"   ✅ Created: {env_path}")
+        if write_if_changed(env_path, env_content):
+            print(f"   ✅ Created: {env_path}")
+        else:
+            print(f"   ✅ Up to date: {env_path}")
     
     def create_startup_script(self):
         """Create production startup script"""
@@ -190,7 +234,8 @@ echo "API documentation available at http://0.0.0.0:8000/docs"
 """
         
         startup_path = self.project_root / "start_production.sh"
-        startup_path.write_text(startup_content)
+        # Identical reruns skip the write but still make sure the script is executable
+        written = write_if_changed(startup_path, startup_content)
         
         # Make executable on Unix systems
         try:
@@ -198,7 +243,10 @@ echo "API documentation available at http://0.0.0.0:8000/docs"
         except:
             pass
         
-        print(f"   ✅ Created: {startup_path}")
+        if written:
+            print(f"   ✅ Created: {startup_path}")
+        else:
+            print(f"   ✅ Up to date: {startup_path}")
     
     def verify_production_setup(self):
         """Verify production setup is correct"""
@@ -25,16 +25,22 @@ class CPTariffDeploymentManager:
     
     def __init__(self):
         self.project_root = Path(__file__).parent
-        self.deployment_log = []
         self.start_time = datetime.now()
+        self._stamp = self.start_time.strftime("%Y%m%d_%H%M%S")
+        self.log_file = self.project_root / f'deployment_{self._stamp}.log'
+        # pip output goes to its own file so the step log stays a clean list of steps
+        self.pip_log_file = self.project_root / f'deployment_{self._stamp}_pip.log'
+        self._log_fh = None
         
     def log_step(self, message: str, success: bool = True):
         """Log deployment step with timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
         status = "✅" if success else "❌"
-        log_entry = f"[{timestamp}] {status} {message}"
+        log_entry = f"[{time.strftime('%H:%M:%S')}] {status} {message}"
         print(log_entry)
-        self.deployment_log.append(log_entry)
+        # Stream each step to disk (line-buffered) so progress survives a crash
+        if self._log_fh is None:
+            self._log_fh = open(self.log_file, 'a', encoding='utf-8', buffering=1)
+        self._log_fh.write(f"{log_entry}\n")
         
     def check_prerequisites(self) -> bool:
         """Check all deployment prerequisites"""
@@ -98,11 +104,36 @@ USE_TESSERACT=True
 """
         
         env_file = self.project_root / '.env'
-        with open(env_file, 'w') as f:
-            f.write(env_content)
+        env_file.write_text(env_content, encoding='utf-8')
         
         self.log_step("Created .env template - please update with your values")
     
+    def run_pip(self, pip_args: list) -> subprocess.CompletedProcess:
+        """Run a quiet pip install, streaming its output into the pip log"""
+        with open(self.pip_log_file, 'a', encoding='utf-8') as pip_log:
+            return subprocess.run([
+                sys.executable, '-m', 'pip', 'install', '--quiet', *pip_args
+            ], check=True, stdout=pip_log, stderr=subprocess.STDOUT)
+    
+    def check_pip_resolution(self, pip_args: list) -> bool:
+        """Resolve requirements with a pip dry run so bad pins fail before anything installs"""
+        try:
+            result = subprocess.run([
+                sys.executable, '-m', 'pip', 'install', '--dry-run', '--quiet', *pip_args
+            ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=300)
+        except subprocess.TimeoutExpired:
+            return True  # Inconclusive; let the real install report
+        
+        # pip older than 22.2 has no --dry-run; the real install reports any conflict
+        if result.returncode == 0 or 'no such option' in result.stderr:
+            return True
+        
+        with open(self.pip_log_file, 'a', encoding='utf-8') as pip_log:
+            pip_log.write(result.stderr)
+        lines = result.stderr.strip().splitlines()
+        self.log_step(f"Dependency resolution failed: {lines[-1] if lines else 'unknown error'}", False)
+        return False
+    
     def install_dependencies(self) -> bool:
         """Install Python dependencies"""
         self.log_step("Installing Python dependencies...")
@@ -110,10 +141,10 @@ USE_TESSERACT=True
         requirements_file = self.project_root / 'requirements.txt'
         
         if requirements_file.exists():
+            if not self.check_pip_resolution(['-r', str(requirements_file)]):
+                return False
             try:
-                subprocess.run([
-                    sys.executable, '-m', 'pip', 'install', '-r', str(requirements_file)
-                ], check=True, capture_output=True)
+                self.run_pip(['-r', str(requirements_file)])
                 self.log_step("Dependencies installed from requirements.txt")
                 return True
             except subprocess.CalledProcessError as e:
@@ -131,15 +162,16 @@ USE_TESSERACT=True
                 'python-multipart==0.0.6'
             ]
             
-            for package in essential_packages:
-                try:
-                    subprocess.run([
-                        sys.executable, '-m', 'pip', 'install', package
-                    ], check=True, capture_output=True)
-                    self.log_step(f"Installed {package}")
-                except subprocess.CalledProcessError as e:
-                    self.log_step(f"Failed to install {package}: {e}", False)
-                    return False
+            if not self.check_pip_resolution(essential_packages):
+                return False
+            
+            # One pip run resolves and downloads the whole set together
+            try:
+                self.run_pip(essential_packages)
+                self.log_step(f"Installed {', '.join(essential_packages)}")
+            except subprocess.CalledProcessError as e:
+                self.log_step(f"Failed to install essential packages: {e}", False)
+                return False
             
             return True
     
@@ -337,6 +369,11 @@ USE_TESSERACT=True
         """Generate deployment summary report"""
         end_time = datetime.now()
         duration = end_time - self.start_time
+        if self._log_fh is not None:
+            self._log_fh.close()
+            self._log_fh = None
+        steps = self.log_file.read_text(encoding='utf-8') if self.log_file.exists() else ""
+        pip_log = f"\n- pip output: {self.pip_log_file}" if self.pip_log_file.exists() else ""
         
         report = f"""
 # CP Tariff OCR API - Deployment Report
@@ -344,12 +381,7 @@ Generated: {end_time.strftime('%Y-%m-%d %H:%M:%S')}
 Duration: {duration.total_seconds():.1f} seconds
 
 ## Deployment Steps
-"""
-        
-        for log_entry in self.deployment_log:
-            report += f"{log_entry}\n"
-        
-        report += f"""
+{steps}
 ## Next Steps
 1. Update .env file with your actual values:
    - OPENAI_API_KEY=your_actual_api_key
@@ -375,12 +407,12 @@ Duration: {duration.total_seconds():.1f} seconds
 - Health check: http://localhost:8000/health
 - API root: http://localhost:8000/
 - Logs directory: {self.project_root}/logs/
+- Deployment log: {self.log_file}{pip_log}
 """
         
         # Save report
-        report_file = self.project_root / f'deployment_report_{end_time.strftime("%Y%m%d_%H%M%S")}.md'
-        with open(report_file, 'w') as f:
-            f.write(report)
+        report_file = self.project_root / f'deployment_report_{self._stamp}.md'
+        report_file.write_text(report, encoding='utf-8')
         
         print(f"\n📋 Deployment report saved to: {report_file}")
         return report
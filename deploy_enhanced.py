@@ -6,35 +6,63 @@ This script deploys the enhanced components to fix the database and data process
 
 import os
 import sys
+import json
+import time
 import shutil
 from pathlib import Path
 from datetime import datetime
 import subprocess
 
+# Files snapshotted before the enhanced components are deployed
+BACKUP_FILES = (
+    "backend/app/main.py",
+    "backend/app/database/cp_tariff_database.py",
+    "backend/app/document_processor/enhanced_field_normalizer.py"
+)
+
+REQUIRED_PACKAGES = (
+    'fastapi', 'uvicorn', 'pyodbc', 'python-multipart',
+    'pillow', 'python-dotenv', 'PyMuPDF'
+)
+
+STARTUP_SCRIPT = '''#!/bin/bash
+# Enhanced CP Tariff OCR System Startup
+echo "🚀 Starting Enhanced CP Tariff OCR System..."
+echo "✨ Features: Enhanced Data Processing + Fixed Database"
+
+cd backend
+python -m uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
+
+echo "🌐 Enhanced system running at http://localhost:8000"
+echo "📚 API documentation: http://localhost:8000/docs"
+'''
+
 class EnhancedSystemDeployer:
     """Deploy enhanced CP Tariff OCR components"""
     
     def __init__(self):
         self.project_root = Path.cwd()
         self.backend_path = self.project_root / "backend"
-        self.backup_path = self.project_root / "backup" / f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # One timestamp names everything this run produces
+        self.started_at = datetime.now()
+        self._stamp = self.started_at.strftime('%Y%m%d_%H%M%S')
+        self.backup_path = self.project_root / "backup" / f"backup_{self._stamp}"
         
-    def log(self, message: str, color: str = ""):
-        """Log with timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"[{timestamp}] {color}{message}")
+    def log(self, message: str, prefix: str = ""):
+        """Log with timestamp and an optional prefix (e.g. a status icon)"""
+        print(f"[{time.strftime('%H:%M:%S')}] {prefix}{message}")
     
     def log_success(self, message: str):
-        self.log(f"✅ {message}")
+        self.log(message, "✅ ")
     
     def log_error(self, message: str):
-        self.log(f"❌ {message}")
+        self.log(message, "❌ ")
     
     def log_warning(self, message: str):
-        self.log(f"⚠️  {message}")
+        self.log(message, "⚠️  ")
     
     def log_info(self, message: str):
-        self.log(f"ℹ️  {message}")
+        self.log(message, "ℹ️  ")
     
     def create_backup(self):
         """Create backup of existing files"""
@@ -43,20 +71,38 @@ class EnhancedSystemDeployer:
         try:
             self.backup_path.mkdir(parents=True, exist_ok=True)
             
-            # Files to backup
-            files_to_backup = [
-                "backend/app/main.py",
-                "backend/app/database/cp_tariff_database.py",
-                "backend/app/document_processor/enhanced_field_normalizer.py"
-            ]
+            # Manifest of the previous run: unchanged files are hardlinked from that backup
+            manifest_path = self.backup_path.parent / ".backup_manifest.json"
+            try:
+                manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                manifest = {}
             
-            for file_path in files_to_backup:
+            for file_path in BACKUP_FILES:
                 source = self.project_root / file_path
-                if source.exists():
-                    dest = self.backup_path / file_path
-                    dest.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(source, dest)
-                    self.log_info(f"Backed up: {file_path}")
+                try:
+                    st = source.stat()  # Follows symlinks, like copyfile below
+                except FileNotFoundError:
+                    continue
+                
+                dest = self.backup_path / file_path
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                
+                previous = manifest.get(file_path)
+                if previous and previous["size"] == st.st_size and previous["mtime_ns"] == st.st_mtime_ns:
+                    try:
+                        os.link(previous["backup"], dest)
+                        manifest[file_path] = dict(previous, backup=str(dest))
+                        self.log_info(f"Unchanged, linked: {file_path}")
+                        continue
+                    except OSError:
+                        pass  # Previous backup gone or links unsupported; copy instead
+                
+                shutil.copyfile(source, dest)
+                manifest[file_path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "backup": str(dest)}
+                self.log_info(f"Backed up: {file_path}")
+            
+            manifest_path.write_text(json.dumps(manifest), encoding='utf-8')
             
             self.log_success(f"Backup created at: {self.backup_path}")
             
@@ -149,14 +195,9 @@ File: backend/app/document_processor/enhanced_data_processor.py
         
         try:
             # Check if all required packages are installed
-            required_packages = [
-                'fastapi', 'uvicorn', 'pyodbc', 'python-multipart',
-                'pillow', 'python-dotenv', 'PyMuPDF'
-            ]
-            
             missing_packages = []
             
-            for package in required_packages:
+            for package in REQUIRED_PACKAGES:
                 try:
                     __import__(package.replace('-', '_'))
                 except ImportError:
@@ -166,14 +207,16 @@ File: backend/app/document_processor/enhanced_data_processor.py
                 self.log_warning(f"Missing packages: {', '.join(missing_packages)}")
                 self.log_info("Installing missing packages...")
                 
-                for package in missing_packages:
-                    try:
-                        subprocess.run([sys.executable, '-m', 'pip', 'install', package], 
-                                     check=True, capture_output=True)
-                        self.log_success(f"Installed {package}")
-                    except subprocess.CalledProcessError as e:
-                        self.log_error(f"Failed to install {package}: {e}")
-                        return False
+                # One pip run resolves and downloads the whole set together
+                try:
+                    subprocess.run([sys.executable, '-m', 'pip', 'install', '--quiet', *missing_packages], 
+                                 check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+                    self.log_success(f"Installed {', '.join(missing_packages)}")
+                except subprocess.CalledProcessError as e:
+                    self.log_error(f"Failed to install {', '.join(missing_packages)}: {e}")
+                    if e.stderr.strip():
+                        self.log_info(e.stderr.strip().splitlines()[-1])
+                    return False
             else:
                 self.log_success("All dependencies are satisfied")
             
@@ -218,26 +261,21 @@ File: backend/app/document_processor/enhanced_data_processor.py
         self.log("📝 Creating startup script...")
         
         try:
-            startup_script = '''#!/bin/bash
-# Enhanced CP Tariff OCR System Startup
-echo "🚀 Starting Enhanced CP Tariff OCR System..."
-echo "✨ Features: Enhanced Data Processing + Fixed Database"
-
-cd backend
-python -m uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
-
-echo "🌐 Enhanced system running at http://localhost:8000"
-echo "📚 API documentation: http://localhost:8000/docs"
-'''
-            
             script_path = self.project_root / "start_enhanced.sh"
-            with open(script_path, 'w') as f:
-                f.write(startup_script)
+            try:
+                unchanged = script_path.read_text(encoding='utf-8') == STARTUP_SCRIPT
+            except FileNotFoundError:
+                unchanged = False
+            if not unchanged:
+                script_path.write_text(STARTUP_SCRIPT, encoding='utf-8')
             
-            # Make executable
+            # Make executable (even when the content was already current)
             os.chmod(script_path, 0o755)
             
-            self.log_success(f"Startup script created: {script_path}")
+            if unchanged:
+                self.log_success(f"Startup script up to date: {script_path}")
+            else:
+                self.log_success(f"Startup script created: {script_path}")
             
         except Exception as e:
             self.log_error(f"Failed to create startup script: {e}")
@@ -250,7 +288,7 @@ echo "📚 API documentation: http://localhost:8000/docs"
         self.log("📋 Generating deployment report...")
         
         report = f'''# Enhanced CP Tariff OCR System Deployment Report
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Generated: {self.started_at.strftime('%Y-%m-%d %H:%M:%S')}
 
 ## What Was Enhanced
 
@@ -319,9 +357,8 @@ If you encounter issues:
 The enhanced system should resolve the database save issues and provide much better data quality from your OCR extractions.
 '''
         
-        report_path = self.project_root / f"enhancement_deployment_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-        with open(report_path, 'w') as f:
-            f.write(report)
+        report_path = self.project_root / f"enhancement_deployment_report_{self._stamp}.md"
+        report_path.write_text(report, encoding='utf-8')
         
         self.log_success(f"Deployment report saved: {report_path}")
         
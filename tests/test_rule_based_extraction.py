@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Regression check for the rule-based tariff extraction
+Compares AIDataProcessor._rule_based_extraction output for a set of sample
+tariff texts against outputs recorded in rule_based_extraction_golden.json.
+Needs only the standard library and the backend sources; no server or OCR.
+"""
+
+import sys
+import json
+import difflib
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List
+
+TESTS_DIR = Path(__file__).resolve().parent
+GOLDEN_PATH = TESTS_DIR / "rule_based_extraction_golden.json"
+
+sys.path.insert(0, str(TESTS_DIR.parent / "backend"))
+
+from app.document_processor.ai_data_processor import AIDataProcessor  # noqa: E402
+
+# Header fields, rate lines in several layouts, numbered/starred notes,
+# commodities, currency markers and a page break
+SAMPLES = [
+    """CANADIAN PACIFIC RAILWAY
+ITEM: 70001   REVISION: 3   CPRS 4445-B
+ISSUE DATE: JUL 22, 2024  EFFECTIVE DATE: Aug 1, 2024
+EXPIRES: DEC 31, 2025
+FROM VANCOUVER BC TO CHICAGO IL
+COMMODITY  01 137 00 WHEAT
+           01 144 10 BARLEY GRAIN
+ORIGIN            DESTINATION       RATE
+Vancouver BC to Chicago IL  $4,512.00 SINGLE CAR COVERED HOPPER CP1234
+Calgary AB   Minneapolis MN   $3210.50 UNIT TRAIN ROUTE: 5678
+Winnipeg MB to Kansas City MO 1234.56 TANK CAR 2024
+1. Rates apply per car.
+2 Subject to fuel surcharge.
+* Equipment supplied by carrier
+Minimum weight 100 tons applies
+Rates in CAD unless noted
+--- Page 2 ---
+TABLE 1 ORIGIN DESTINATION
+12. Corn and SOYBEAN shipments
+""",
+    """Item 12 revision 7
+Toronto ON to Chicago IL $99.99 gondola
+C$ currency
+wheat canola
+""",
+    """no useful text here at all but long enough""",
+    """ISSUE JAN 5 2023 EFFECTIVE FEB 10, 2023 EXPIRATION MAR 3, 2024
+VANCOUVER BC and CALGARY AB rates 12.34 between them
+KANSAS CITY MO    TORONTO ON    $55.00 BOXCAR
+from montreal qc to toronto on
+ 3.  note with leading space
+*
+""",
+]
+
+def extract_all() -> List[Dict[str, Any]]:
+    """Run the rule-based extraction over every sample, normalised through JSON"""
+    processor = AIDataProcessor()
+    results = [processor._rule_based_extraction(sample) for sample in SAMPLES]
+    return json.loads(json.dumps(results, sort_keys=True))
+
+def test_rule_based_extraction_matches_recorded():
+    """Extraction output is unchanged from the recorded outputs"""
+    recorded = json.loads(GOLDEN_PATH.read_text(encoding='utf-8'))
+    assert extract_all() == recorded
+
+def main():
+    parser = argparse.ArgumentParser(description="Rule-based extraction regression check")
+    parser.add_argument("--record", action="store_true",
+                        help="Overwrite the recorded outputs with the current ones")
+    args = parser.parse_args()
+    
+    current = extract_all()
+    if args.record:
+        GOLDEN_PATH.write_text(json.dumps(current, indent=1, sort_keys=True) + "\n", encoding='utf-8')
+        print(f"Recorded {len(current)} outputs to {GOLDEN_PATH.name}")
+        return
+    
+    recorded = json.loads(GOLDEN_PATH.read_text(encoding='utf-8'))
+    if current == recorded:
+        print(f"✅ Rule-based extraction matches {len(recorded)} recorded outputs")
+        return
+    
+    diff = difflib.unified_diff(
+        json.dumps(recorded, indent=1, sort_keys=True).splitlines(),
+        json.dumps(current, indent=1, sort_keys=True).splitlines(),
+        "recorded", "current", lineterm=""
+    )
+    print("❌ Rule-based extraction differs from recorded outputs:")
+    print("\n".join(diff))
+    sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,42 @@ This script checks if all components are properly installed and configured.
 
 import os
 import sys
+import shutil
+import functools
 import subprocess
 import importlib.util
+import importlib.metadata
 import json
+import time
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import re
 
+# Version specifier separating a package name from its pin in requirements.txt
+REQUIREMENT_SPEC_RE = re.compile(r'[=><]')
+# Separator runs that PEP 503 treats as equivalent in distribution names
+DIST_NAME_SEPARATOR_RE = re.compile(r'[-_.]+')
+# KEY=VALUE assignment in a .env file, skipping comment lines; key and value come back stripped
+ENV_LINE_RE = re.compile(r'^(?![^\S\n]*#)[^\S\n]*([^=\n]*?)[^\S\n]*=[^\S\n]*(.*?)[^\S\n]*$', re.MULTILINE)
+
+# OCR dependencies with native parts (import name, distribution name); these can be
+# installed yet fail to import, and ocr_engine swallows that, so they are import-probed
+OCR_IMPORT_PROBES = (
+    ('paddleocr', 'paddleocr'),
+    ('cv2', 'opencv-python'),
+    ('pytesseract', 'pytesseract'),
+    ('fitz', 'PyMuPDF')
+)
+
+def normalize_dist_name(name: str) -> str:
+    """Normalize a distribution name per PEP 503 for comparison"""
+    return DIST_NAME_SEPARATOR_RE.sub('-', name).lower()
+
+@functools.lru_cache(maxsize=None)
+def which(command: str) -> Optional[str]:
+    """Resolve an executable on PATH once per run (shutil.which stats every PATH entry)"""
+    return shutil.which(command)
+
 # Color codes for terminal output
 class Colors:
     GREEN = '\033[92m'
@@ -62,6 +91,15 @@ class InstallationVerifier:
     def __init__(self, verbose: bool = True):
         self.verbose = verbose
         self.result = VerificationResult()
+        self._env_vars: Optional[Dict[str, str]] = None
+
+    def load_env_vars(self) -> Dict[str, str]:
+        """Parse .env once with a single read and regex scan; cached for later checks"""
+        if self._env_vars is None:
+            env_path = Path('.env')
+            text = env_path.read_text(encoding='utf-8') if env_path.exists() else ''
+            self._env_vars = dict(ENV_LINE_RE.findall(text))
+        return self._env_vars
 
     def check_python_version(self) -> bool:
         """Check Python version compatibility"""
@@ -106,8 +144,13 @@ class InstallationVerifier:
         
         for dep_name, dep_info in dependencies.items():
             try:
+                # Resolve on PATH first so missing tools never cost a process spawn
+                executable = which(dep_info['command'][0])
+                if executable is None:
+                    raise FileNotFoundError(dep_info['command'][0])
+                
                 result = subprocess.run(
-                    dep_info['command'], 
+                    [executable, *dep_info['command'][1:]], 
                     capture_output=True, 
                     text=True,
                     timeout=10
@@ -165,42 +208,34 @@ class InstallationVerifier:
         
         # Parse requirements
         required_packages = []
-        with open(requirements_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    # Extract package name (before == or >=)
-                    package_name = re.split(r'[=><]', line)[0].strip()
-                    required_packages.append(package_name)
+        for line in requirements_file.read_text(encoding='utf-8').splitlines():
+            line = line.strip()
+            if line and not line.startswith('#'):
+                # Extract package name (before == or >=)
+                package_name = REQUIREMENT_SPEC_RE.split(line, 1)[0].strip()
+                required_packages.append(package_name)
         
         missing_packages = []
         installed_packages = []
         
-        # Package name mappings for import vs pip names
-        package_mappings = {
-            'opencv-python': 'cv2',
-            'pillow': 'PIL',
-            'python-multipart': 'multipart',
-            'python-dotenv': 'dotenv',
-            'psycopg2-binary': 'psycopg2',
-            'python-dateutil': 'dateutil',
-            'typing-extensions': 'typing_extensions'
-        }
+        # One query of installed distributions instead of importing every package
+        try:
+            installed_dists = {
+                normalize_dist_name(dist.metadata['Name'])
+                for dist in importlib.metadata.distributions()
+                if dist.metadata['Name']
+            }
+        except Exception as e:
+            self.result.add_warning(f"Error listing installed packages: {e}")
+            return False, required_packages
         
         for package in required_packages:
-            # Determine the import name
-            import_name = package_mappings.get(package, package)
-            
-            try:
-                # Try to import the package
-                importlib.import_module(import_name)
+            if normalize_dist_name(package) in installed_dists:
                 self.result.add_pass(f"{package} is installed")
                 installed_packages.append(package)
-            except ImportError:
+            else:
                 self.result.add_fail(f"{package} not found")
                 missing_packages.append(package)
-            except Exception as e:
-                self.result.add_warning(f"Error checking {package}: {e}")
         
         if missing_packages:
             self.result.add_fail(
@@ -208,7 +243,37 @@ class InstallationVerifier:
                 f"Run: pip install {' '.join(missing_packages)}"
             )
         
-        return len(missing_packages) == 0, missing_packages
+        # Installed metadata doesn't prove a native library loads; import the OCR stack
+        broken_packages = []
+        for module_name, dist_name in OCR_IMPORT_PROBES:
+            if normalize_dist_name(dist_name) not in installed_dists:
+                continue  # Already reported as missing (or not required)
+            try:
+                importlib.import_module(module_name)
+            except Exception as e:
+                self.result.add_fail(
+                    f"{dist_name} is installed but fails to import: {e}",
+                    f"Reinstall {dist_name} and check its native libraries"
+                )
+                broken_packages.append(dist_name)
+        
+        # Optional extras only warn; the OCR engine has fallbacks for each
+        optional_file = Path("backend/requirements-optional.txt")
+        if optional_file.exists():
+            for line in optional_file.read_text(encoding='utf-8').splitlines():
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                package_name = REQUIREMENT_SPEC_RE.split(line, 1)[0].strip()
+                if normalize_dist_name(package_name) in installed_dists:
+                    self.result.add_pass(f"{package_name} is installed (optional)")
+                else:
+                    self.result.add_warning(
+                        f"{package_name} not installed (optional)",
+                        "Run: pip install -r backend/requirements-optional.txt (see file for native build prerequisites)"
+                    )
+        
+        return not missing_packages and not broken_packages, missing_packages + broken_packages
 
     def check_file_structure(self) -> Tuple[bool, List[str]]:
         """Check if all required files and directories exist"""
@@ -300,14 +365,8 @@ class InstallationVerifier:
         self.result.add_pass(".env file exists")
         
         # Load and check environment variables
-        env_vars = {}
         try:
-            with open('.env', 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        env_vars[key.strip()] = value.strip()
+            env_vars = self.load_env_vars()
         except Exception as e:
             self.result.add_fail(f"Error reading .env file: {e}")
             return False
@@ -353,14 +412,7 @@ class InstallationVerifier:
         self.result.add_header("Database Connection Check")
         
         # Load environment variables
-        env_vars = {}
-        if Path('.env').exists():
-            with open('.env', 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        env_vars[key.strip()] = value.strip()
+        env_vars = self.load_env_vars()
         
         db_host = env_vars.get('DB_HOST', 'localhost')
         db_port = env_vars.get('DB_PORT', '5432')
@@ -375,10 +427,13 @@ class InstallationVerifier:
             )
             return False
         
+        # Falls back to the bare name so a missing client still raises FileNotFoundError
+        psql = which('psql') or 'psql'
+        
         try:
             # Test basic connection
             cmd = [
-                'psql', 
+                psql, 
                 f'postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}',
                 '-c', 'SELECT 1;'
             ]
@@ -395,7 +450,7 @@ class InstallationVerifier:
                 
                 # Check schema
                 schema_cmd = [
-                    'psql',
+                    psql,
                     f'postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}',
                     '-t', '-c',
                     "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = 'public' AND table_name LIKE 'tariff_%';"
@@ -486,7 +541,7 @@ class InstallationVerifier:
     def generate_installation_report(self) -> Dict:
         """Generate a detailed installation report"""
         return {
-            "timestamp": subprocess.run(['date'], capture_output=True, text=True).stdout.strip(),
+            "timestamp": time.strftime('%a %b %d %H:%M:%S %Z %Y'),
             "python_version": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
             "platform": sys.platform,
             "working_directory": str(Path.cwd()),
@@ -599,8 +654,8 @@ def main():
     # Generate report if requested
     if args.report:
         report = verifier.generate_installation_report()
-        with open(args.report, 'w') as f:
-            json.dump(report, f, indent=2)
+        # Serialize in one call and write once; json.dump issues a write per token
+        Path(args.report).write_text(json.dumps(report, indent=2), encoding='utf-8')
         print(f"\nDetailed report saved to: {args.report}")
     
     # Exit with appropriate code